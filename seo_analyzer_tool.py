@@ -1,11 +1,29 @@
 import streamlit as st
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
 from urllib.parse import urlparse
 from collections import Counter
+from itertools import islice
+import hashlib
 import re
+import pandas as pd
 import plotly.graph_objects as go
 
+MAX_PAGE_BYTES = 5_000_000
+# Elements whose contents get_text never counted as visible page text
+NON_TEXT_TAGS = frozenset(["script", "style", "template"])
+NON_ALPHA_RE = re.compile(r"[^a-zA-Z\s]+")
+META_DESCRIPTION_KEYS = (
+    ("name", "description"),
+    ("name", "Description"),
+    ("property", "og:description"),
+    ("name", "twitter:description"),
+)
+STOPWORDS = frozenset([
+    "the", "and", "is", "in", "to", "of", "for", "on", "with", "a", "an", "as", "by", "at",
+    "this", "that", "it", "be", "are", "from", "or", "we", "you", "your", "can", "our"
+])
+
 st.set_page_config(page_title="Advanced SEO Analyzer", layout="centered")
 st.title("🔍 Advanced SEO Analyzer")
 st.markdown("*Developed by **Pravesh Patel***", unsafe_allow_html=True)
@@ -14,67 +32,173 @@ st.write("Enter a URL to perform an enhanced on-page SEO analysis including keyw
 url = st.text_input("Enter a full URL (e.g., https://example.com)")
 target_keyword = st.text_input("Enter your target keyword/phrase (e.g., best SEO tools)").strip().lower()
 
+@st.cache_data(show_spinner=False, ttl=3600)
+def download_page(url):
+    headers = {"User-Agent": "Mozilla/5.0"}
+    with requests.get(url, headers=headers, timeout=10, stream=True) as response:
+        # Error statuses raise so a transient 503/429 is never cached as the page
+        response.raise_for_status()
+        # Stop reading oversized pages instead of holding the whole body in memory
+        content = bytearray()
+        for chunk in response.iter_content(65536):
+            content.extend(chunk)
+            if len(content) >= MAX_PAGE_BYTES:
+                del content[MAX_PAGE_BYTES:]
+                break
+        # Trust a declared charset, otherwise assume UTF-8 instead of sniffing the body
+        encoding = response.encoding if "charset" in response.headers.get("Content-Type", "").lower() else "utf-8"
+    try:
+        return content.decode(encoding, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
 def fetch_page_content(url):
+    # Errors are raised out of the cached download so they are never memoized
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=10)
-        return response.text
+        return download_page(url)
     except Exception as e:
         st.error(f"Error fetching URL: {e}")
         return None
 
 def clean_and_tokenize(text):
-    text = re.sub(r"[^a-zA-Z\s]", "", text.lower())
+    text = NON_ALPHA_RE.sub("", text.lower())
     words = text.split()
-    stopwords = set([
-        "the", "and", "is", "in", "to", "of", "for", "on", "with", "a", "an", "as", "by", "at",
-        "this", "that", "it", "be", "are", "from", "or", "we", "you", "your", "can", "our"
-    ])
-    keywords = [word for word in words if word not in stopwords and len(word) > 2]
+    # Per-call canonical map so repeated words share one string across n-gram tuple keys
+    canon = {}
+    keywords = [canon.setdefault(word, word) for word in words if word not in STOPWORDS and len(word) > 2]
     return keywords, Counter(keywords), len(words), text
 
-def get_ngram_density(words, n):
-    ngrams = zip(*[words[i:] for i in range(n)])
-    phrases = [' '.join(gram) for gram in ngrams]
-    return Counter(phrases).most_common(10)
-
-def analyze_seo(html, keyword):
-    soup = BeautifulSoup(html, "html.parser")
+def get_ngram_densities(words):
+    # Count tuple keys straight from zip iterators; only the top phrases are joined
+    densities = []
+    for n in (2, 3, 4):
+        counts = Counter(zip(*[islice(words, i, None) for i in range(n)]))
+        densities.append([(' '.join(gram), freq) for gram, freq in counts.most_common(10)])
+    return tuple(densities)
+
+class PageCollector:
+    """lxml parser target that gathers every on-page SEO signal in one pass."""
+
+    def __init__(self):
+        self.title = None
+        self.meta_descriptions = {}
+        self.h1_tags = []
+        self.images_total = 0
+        self.images_missing_alt = 0
+        self.has_canonical = False
+        self.text_parts = []
+        self.pending = []
+        self.in_title = False
+        self.h1_depth = 0
+        self.skip_depth = 0
+
+    def flush(self):
+        # lxml may split one text node across several data callbacks
+        if self.pending:
+            chunk = ''.join(self.pending)
+            self.pending = []
+            if self.in_title and not self.skip_depth:
+                self.title += chunk
+            if self.h1_depth and not self.skip_depth:
+                self.h1_tags[-1] += chunk
+            if not self.skip_depth:
+                self.text_parts.append(chunk)
+
+    def start(self, tag, attrib):
+        self.flush()
+        if tag in NON_TEXT_TAGS:
+            self.skip_depth += 1
+        elif tag == "title":
+            if self.title is None:
+                self.title = ""
+                self.in_title = True
+        elif tag == "meta":
+            for key in META_DESCRIPTION_KEYS:
+                if attrib.get(key[0]) == key[1]:
+                    self.meta_descriptions.setdefault(key, attrib.get("content"))
+        elif tag == "h1":
+            if not self.h1_depth:
+                self.h1_tags.append("")
+            self.h1_depth += 1
+        elif tag == "img":
+            self.images_total += 1
+            if not attrib.get("alt"):
+                self.images_missing_alt += 1
+        elif tag == "link":
+            if "canonical" in attrib.get("rel", "").split():
+                self.has_canonical = True
+
+    def end(self, tag):
+        self.flush()
+        if tag in NON_TEXT_TAGS:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+        elif tag == "title":
+            self.in_title = False
+        elif tag == "h1":
+            self.h1_depth = max(self.h1_depth - 1, 0)
+
+    def data(self, data):
+        self.pending.append(data)
+
+    def close(self):
+        self.flush()
+        return self
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def parse_page(html_hash, _html):
+    # Keyword-independent stage, keyed on the page hash so reruns skip the parse
+    parser = etree.HTMLParser(target=PageCollector(), encoding="utf-8")
+    parser.feed(_html.encode("utf-8"))
+    page = parser.close()
+
+    title = page.title.strip() if page.title and page.title.strip() else "❌ No title tag"
+
+    meta_desc_content = next((page.meta_descriptions[key] for key in META_DESCRIPTION_KEYS if key in page.meta_descriptions), None)
+    meta_description = meta_desc_content.strip() if meta_desc_content else "❌ No meta description"
+
+    h1_tags = [h1.strip() for h1 in page.h1_tags]
+
+    text = ' '.join(page.text_parts)
+    words, keyword_counter, total_words, cleaned_text = clean_and_tokenize(text)
+    bigrams, trigrams, fourgrams = get_ngram_densities(words)
 
-    title = soup.title.string.strip() if soup.title else "❌ No title tag"
+    return {
+        "title": title,
+        "meta_description": meta_description,
+        "h1_tags": h1_tags,
+        "images_total": page.images_total,
+        "images_missing_alt": page.images_missing_alt,
+        "word_count": total_words,
+        "bigrams": bigrams,
+        "trigrams": trigrams,
+        "fourgrams": fourgrams,
+        "has_canonical": page.has_canonical,
+        # Lowercased once here so keyword checks never re-lowercase per rerun;
+        # H1s are newline-joined since a single-line keyword cannot span them
+        "title_lower": title.lower(),
+        "meta_description_lower": meta_description.lower(),
+        "h1_lower": '\n'.join(h1_tags).lower(),
+    }
 
-    meta_desc_tag = (
-        soup.find("meta", attrs={"name": "description"}) or
-        soup.find("meta", attrs={"name": "Description"}) or
-        soup.find("meta", attrs={"property": "og:description"}) or
-        soup.find("meta", attrs={"name": "twitter:description"})
-    )
-    meta_description = meta_desc_tag["content"].strip() if meta_desc_tag and meta_desc_tag.get("content") else "❌ No meta description"
+def analyze_seo(html, keyword):
+    page = parse_page(hashlib.blake2b(html.encode()).hexdigest(), html)
 
-    h1_tags = [h1.get_text().strip() for h1 in soup.find_all("h1")]
+    title = page["title"]
+    meta_description = page["meta_description"]
+    h1_tags = page["h1_tags"]
     h1_info = h1_tags if h1_tags else ["❌ No H1 tag found"]
-
-    images = soup.find_all("img")
-    missing_alt = [img for img in images if not img.get("alt")]
-    images_total = len(images)
-    images_missing_alt = len(missing_alt)
-
-    text = soup.get_text(separator=' ', strip=True)
-    words, keyword_counter, total_words, cleaned_text = clean_and_tokenize(text)
-
-    bigrams = get_ngram_density(words, 2)
-    trigrams = get_ngram_density(words, 3)
-    fourgrams = get_ngram_density(words, 4)
+    images_total = page["images_total"]
+    images_missing_alt = page["images_missing_alt"]
 
     title_score = min(len(title), 60)
     desc_score = min(len(meta_description), 160)
     h1_score = 10 if h1_tags else 0
     image_score = 10 if images_total == 0 else round(((images_total - images_missing_alt) / images_total) * 10, 2)
 
-    keyword_in_title = 5 if keyword and keyword in title.lower() else 0
-    keyword_in_h1 = 5 if keyword and any(keyword in h.lower() for h in h1_tags) else 0
-    keyword_in_meta = 5 if keyword and keyword in meta_description.lower() else 0
-    canonical_tag = 5 if soup.find("link", rel="canonical") else 0
+    keyword_in_title = 5 if keyword and keyword in page["title_lower"] else 0
+    keyword_in_h1 = 5 if keyword and keyword in page["h1_lower"] else 0
+    keyword_in_meta = 5 if keyword and keyword in page["meta_description_lower"] else 0
+    canonical_tag = 5 if page["has_canonical"] else 0
 
     keyword_consistency_score = 10 if keyword_in_title and keyword_in_meta and keyword_in_h1 else 0
 
@@ -93,10 +217,10 @@ def analyze_seo(html, keyword):
         "h1_tags": h1_info,
         "images_total": images_total,
         "images_missing_alt": images_missing_alt,
-        "word_count": total_words,
-        "bigrams": bigrams,
-        "trigrams": trigrams,
-        "fourgrams": fourgrams,
+        "word_count": page["word_count"],
+        "bigrams": page["bigrams"],
+        "trigrams": page["trigrams"],
+        "fourgrams": page["fourgrams"],
         "title_score": title_score,
         "desc_score": desc_score,
         "total_score": total_score,
@@ -104,8 +228,10 @@ def analyze_seo(html, keyword):
         "keyword": keyword
     }
 
-def render_gauge(label, value, max_value):
-    fig = go.Figure(go.Indicator(
+@st.cache_resource(show_spinner=False, max_entries=64)
+def build_gauge(label, value, max_value):
+    # Shared across reruns; st.plotly_chart serializes a copy and never mutates it
+    return go.Figure(go.Indicator(
         mode="gauge+number",
         value=value,
         domain={'x': [0, 1], 'y': [0, 1]},
@@ -119,7 +245,9 @@ def render_gauge(label, value, max_value):
             ]
         }
     ))
-    st.plotly_chart(fig, use_container_width=True)
+
+def render_gauge(label, value, max_value):
+    st.plotly_chart(build_gauge(label, value, max_value), use_container_width=True)
 
 def display_recommendations(score, results):
     st.subheader("📌 Recommendations")
@@ -182,16 +310,13 @@ if url:
             st.write(f"{results['word_count']} words on the page")
 
             st.subheader("🔗 2-Word Phrases (Bigrams)")
-            for phrase, freq in results["bigrams"]:
-                st.write(f"{phrase} — {freq} times")
+            st.dataframe(pd.DataFrame(results["bigrams"], columns=["Phrase", "Frequency"]), hide_index=True)
 
             st.subheader("🔗 3-Word Phrases (Trigrams)")
-            for phrase, freq in results["trigrams"]:
-                st.write(f"{phrase} — {freq} times")
+            st.dataframe(pd.DataFrame(results["trigrams"], columns=["Phrase", "Frequency"]), hide_index=True)
 
             st.subheader("🔗 4-Word Phrases")
-            for phrase, freq in results["fourgrams"]:
-                st.write(f"{phrase} — {freq} times")
+            st.dataframe(pd.DataFrame(results["fourgrams"], columns=["Phrase", "Frequency"]), hide_index=True)
 
             st.subheader("🏁 Total SEO Score")
             render_gauge("Total SEO Score", results['total_score'], 100)